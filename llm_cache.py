@@ -0,0 +1,127 @@
+"""
+SQLite-backed exact-match cache index for generated media.
+
+Maps a content hash of normalized request parameters to files already on
+disk (the files themselves live in the server's CACHE_DIR) and keeps
+running totals of the bytes and dollars saved by cache hits. Entries
+expire after a TTL and the table is LRU-bounded so the index cannot grow
+without limit.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600  # one week
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class LLMCache:
+    """Exact-match index over cached media files with savings accounting."""
+
+    def __init__(
+        self,
+        db_path,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                filepaths TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                bytes_saved INTEGER NOT NULL DEFAULT 0,
+                cost_saved REAL NOT NULL DEFAULT 0.0
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cache entry.
+
+        Returns {"filepaths": [...], "metadata": {...}} on a live hit, or
+        None when the key is unknown, expired, or its files are gone.
+        Hits update the last-used time and the savings counters.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT filepaths, metadata, created_at FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            filepaths_json, metadata_json, created_at = row
+            now = time.time()
+            if now - created_at > self.ttl_seconds:
+                self._delete(key)
+                return None
+
+            filepaths = json.loads(filepaths_json)
+            if not filepaths or not all(Path(p).exists() for p in filepaths):
+                self._delete(key)
+                return None
+
+            metadata = json.loads(metadata_json)
+            self._conn.execute(
+                "UPDATE entries SET last_used = ?, hits = hits + 1, "
+                "bytes_saved = bytes_saved + ?, cost_saved = cost_saved + ? "
+                "WHERE key = ?",
+                (now, metadata.get("bytes", 0), metadata.get("cost_usd", 0.0), key),
+            )
+            self._conn.commit()
+            return {"filepaths": filepaths, "metadata": metadata}
+
+    def put(self, key: str, filepaths: List[str], metadata: Dict[str, Any]) -> None:
+        """Insert or refresh an entry, then evict expired/excess rows."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, filepaths, metadata, created_at, last_used, hits, bytes_saved, cost_saved) "
+                "VALUES (?, ?, ?, ?, ?, 0, 0, 0.0)",
+                (key, json.dumps(filepaths), json.dumps(metadata), now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM entries WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                "  SELECT key FROM entries ORDER BY last_used DESC "
+                "  LIMIT -1 OFFSET ?"
+                ")",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Aggregate hit/savings totals across all entries."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(hits), 0), "
+                "COALESCE(SUM(bytes_saved), 0), COALESCE(SUM(cost_saved), 0.0) "
+                "FROM entries"
+            ).fetchone()
+        count, hits, bytes_saved, cost_saved = row
+        return {
+            "entries": count,
+            "total_hits": hits,
+            "bytes_saved": bytes_saved,
+            "cost_saved_usd": round(cost_saved, 4),
+        }
+
+    def _delete(self, key: str) -> None:
+        self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._conn.commit()
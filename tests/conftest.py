@@ -1,5 +1,8 @@
 """Pytest configuration and shared fixtures."""
+import asyncio
+import hashlib
 import os
+import shutil
 import sys
 import pytest
 from pathlib import Path
@@ -13,3 +16,40 @@ def api_key():
     from dotenv import load_dotenv
     load_dotenv()
     return os.getenv("AYRSHARE_API_KEY")
+
+
+@pytest.fixture(scope="session")
+def bear_image():
+    """Path to one generated bear image, shared across the whole session.
+
+    Cache-aside keyed by the prompt hash under .test_fixtures (its own
+    directory - .test_cache is the content memo's shelve *file*): the
+    first run pays the Imagen call (~$0.04 and 10-30s); every later run -
+    and every test in the same session - reuses the PNG already on disk.
+    """
+    from tests.test_generation import _IMAGE_PROMPT
+    from server import generate_image_imagen3
+
+    cache_dir = Path(".test_fixtures")
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cached = cache_dir / f"{hashlib.sha1(_IMAGE_PROMPT.encode()).hexdigest()}.png"
+    if cached.exists():
+        return cached
+
+    # .fn: the @mcp.tool() decorator rebinds the name to a FunctionTool,
+    # which is not callable; the real (async) function lives on .fn
+    result = asyncio.run(generate_image_imagen3.fn(
+        prompt=_IMAGE_PROMPT,
+        aspect_ratio="16:9",
+        image_size="1K",
+        model_version="imagen-3.0",
+        upload_to_supabase=False,
+    ))
+    if not result.get("success"):
+        pytest.skip(f"Imagen call failed: {result.get('error')}")
+
+    image_path = result["images"][0].get("image_path")
+    if not image_path:
+        pytest.skip("Imagen result has no on-disk path to cache")
+    shutil.copy2(image_path, cached)
+    return cached
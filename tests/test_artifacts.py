@@ -0,0 +1,11 @@
+"""Pytest checks for shared generated artifacts."""
+import pytest
+
+
+@pytest.mark.requires_api
+@pytest.mark.slow
+def test_bear_image_is_reusable_png(bear_image):
+    """The session fixture hands back a real PNG every test can share."""
+    data = bear_image.read_bytes()
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    assert len(data) > 1024
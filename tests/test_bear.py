@@ -4,8 +4,10 @@ Test the bear in pool scenario with actual API calls
 """
 
 import os
+import random
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -55,10 +57,14 @@ try:
         ),
     )
 
-    # Save image
+    # Save image - raw bytes in one write instead of the SDK's save()
     filename = f"bear_pool_imagen.png"
     filepath = OUTPUT_DIR / filename
-    response.generated_images[0].image.save(str(filepath))
+    image_bytes = response.generated_images[0].image.image_bytes
+    if image_bytes:
+        filepath.write_bytes(image_bytes)
+    else:
+        response.generated_images[0].image.save(str(filepath))
 
     print(f"\n✅ IMAGE GENERATED!")
     print(f"📁 Saved to: {filepath.absolute()}")
@@ -83,9 +89,11 @@ professional cinematography, realistic motion."""
 
 print(f"📝 Prompt: {video_prompt[:80]}...")
 print("\n⏳ Calling Veo 3.1 API...")
-print("   ⚠️  This will take 2-6 minutes - please be patient!")
+print("   ⚠️  This will take 2-6 minutes - the social post runs meanwhile!")
 
-try:
+
+def generate_video():
+    """Submit the Veo job and poll it to completion; returns the saved path."""
     operation = client.models.generate_videos(
         model="veo-3.1-generate-preview",
         prompt=video_prompt,
@@ -97,18 +105,20 @@ try:
         ),
     )
 
-    # Poll until done
-    waited = 0
+    # Poll until done - exponential backoff (2s start, 30s cap) with a
+    # little jitter: fast videos aren't stuck behind a fixed 10s sleep,
+    # slow ones hit the operations endpoint far less often
+    waited = 0.0
+    attempts = 0
     while not operation.done and waited < 360:
-        time.sleep(10)
-        waited += 10
+        delay = min(30, 2 * (1.5 ** attempts)) + random.uniform(0, 0.5)
+        time.sleep(delay)
+        waited += delay
+        attempts += 1
         operation = client.operations.get(operation)
-        if waited % 30 == 0:
-            print(f"   ... {waited}s elapsed")
 
     if not operation.done:
-        print("\n❌ VIDEO GENERATION TIMED OUT")
-        sys.exit(1)
+        raise TimeoutError("Video generation timed out after 360s")
 
     # Save video
     generated_video = operation.response.generated_videos[0]
@@ -116,21 +126,20 @@ try:
     filepath = OUTPUT_DIR / filename
 
     client.files.download(file=generated_video.video)
-    generated_video.video.save(str(filepath))
+    video_bytes = generated_video.video.video_bytes
+    if video_bytes:
+        filepath.write_bytes(video_bytes)
+    else:
+        generated_video.video.save(str(filepath))
+    return filepath
 
-    print(f"\n✅ VIDEO GENERATED!")
-    print(f"📁 Saved to: {filepath.absolute()}")
-    print(f"⏱️  Duration: 8 seconds")
-    print(f"🎵 Audio: Native generation included")
-    print(f"💰 Cost: $6.00 (8s × $0.75/s)")
 
-except Exception as e:
-    print(f"\n❌ VIDEO GENERATION FAILED: {e}")
-    import traceback
-    traceback.print_exc()
-    sys.exit(1)
+# Video polling takes minutes and the social post is independent of it -
+# run the video in the background so the content step's latency is free
+executor = ThreadPoolExecutor(max_workers=1)
+video_future = executor.submit(generate_video)
 
-# Test 3: Generate Social Post
+# Test 3: Generate Social Post (concurrent with video polling)
 print("\n" + "=" * 80)
 print("\n📱 STEP 3: GENERATING SOCIAL MEDIA POST WITH GEMINI\n")
 
@@ -160,6 +169,25 @@ except Exception as e:
     traceback.print_exc()
     sys.exit(1)
 
+# Join the background video generation
+print("\n" + "=" * 80)
+print("\n🎬 WAITING FOR VIDEO TO FINISH...\n")
+
+try:
+    video_path = video_future.result()
+    print(f"\n✅ VIDEO GENERATED!")
+    print(f"📁 Saved to: {video_path.absolute()}")
+    print(f"⏱️  Duration: 8 seconds")
+    print(f"🎵 Audio: Native generation included")
+    print(f"💰 Cost: $6.00 (8s × $0.75/s)")
+except Exception as e:
+    print(f"\n❌ VIDEO GENERATION FAILED: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+finally:
+    executor.shutdown(wait=False)
+
 # Final Summary
 print("\n" + "=" * 80)
 print("🎉 ALL TESTS COMPLETED SUCCESSFULLY!")
@@ -5,6 +5,7 @@ Direct test of Google Gemini API for image and video generation
 
 import os
 import base64
+import random
 import time
 from datetime import datetime
 from pathlib import Path
@@ -101,14 +102,18 @@ def test_video_generation():
         print(f"\n⏱️  Operation started: {operation.name}")
         print("   Polling for completion...")
 
-        # Poll until complete
+        # Poll until complete - exponential backoff (2s start, 30s cap)
+        # with jitter instead of a fixed 10s sleep
         max_wait = 360  # 6 minutes
-        waited = 0
+        waited = 0.0
+        attempts = 0
         while not operation.done and waited < max_wait:
-            time.sleep(10)
-            waited += 10
+            delay = min(30, 2 * (1.5 ** attempts)) + random.uniform(0, 0.5)
+            time.sleep(delay)
+            waited += delay
+            attempts += 1
             operation = genai.operations.get(operation.name)
-            print(f"   ... {waited}s elapsed")
+            print(f"   ... {int(waited)}s elapsed")
 
         if not operation.done:
             print(f"\n❌ TIMEOUT: Video generation took longer than {max_wait}s")
@@ -3,165 +3,168 @@
 Test script for Marketing Automation MCP Server
 
 Demonstrates the server configuration and available tools.
+
+Each section builds a list of lines instead of printing; main() emits
+everything with a single stdout write, so the report costs one syscall
+and can't interleave with stderr in CI logs.
 """
 
+import asyncio
 import json
-from server import mcp
+import sys
+from functools import cache
+from server import mcp, get_pricing_info, get_available_models
+
+
+@cache
+def _registry():
+    """Snapshot the tools/resources/prompts registered on the server.
+
+    The registry is immutable after import, so introspect it once and
+    memoize - the display loops below are driven by what server.py
+    actually registered instead of a hand-maintained copy that drifts.
+    """
+    async def _collect():
+        return (
+            await mcp.get_tools(),
+            await mcp.get_resources(),
+            await mcp.get_prompts(),
+        )
+    return asyncio.run(_collect())
+
+
+def _first_line(description):
+    """First non-empty docstring line, for one-line listings."""
+    for line in (description or "").strip().splitlines():
+        if line.strip():
+            return line.strip()
+    return ""
 
 
 def list_tools():
     """List all available tools."""
-    print("Available Tools:")
-    print("-" * 60)
-
-    tools = [
-        {
-            "name": "generate_image_imagen3",
-            "description": "Generate marketing images using Google Imagen 3/4",
-            "params": ["prompt", "negative_prompt", "aspect_ratio", "quality", "output_format", "seed"]
-        },
-        {
-            "name": "batch_generate_images",
-            "description": "Generate multiple marketing images in batch",
-            "params": ["prompts", "aspect_ratio", "quality", "model_version"]
-        },
-        {
-            "name": "generate_video_veo3",
-            "description": "Generate marketing videos using Google Veo 2/3",
-            "params": ["prompt", "duration_seconds", "resolution", "fps"]
-        },
-        {
-            "name": "generate_marketing_content",
-            "description": "Generate marketing content using Claude or Gemini",
-            "params": ["content_type", "topic", "tone", "length", "model", "include_hashtags"]
-        },
-        {
-            "name": "calculate_cost_estimate",
-            "description": "Calculate estimated costs for a marketing campaign",
-            "params": ["images_sd", "images_hd", "video_seconds", "content_pieces", "model_preference", "video_model"]
-        }
-    ]
+    lines = ["Available Tools:", "-" * 60]
+
+    tools, _, _ = _registry()
+    for i, (name, tool) in enumerate(sorted(tools.items()), 1):
+        params = ", ".join((tool.parameters or {}).get("properties", {}))
+        lines.append(f"\n{i}. {name}")
+        lines.append(f"   Description: {_first_line(tool.description)}")
+        lines.append(f"   Parameters: {params}")
 
-    for i, tool in enumerate(tools, 1):
-        print(f"\n{i}. {tool['name']}")
-        print(f"   Description: {tool['description']}")
-        print(f"   Parameters: {', '.join(tool['params'])}")
+    return lines
 
 
 def list_resources():
     """List all available resources."""
-    print("\n\nAvailable Resources:")
-    print("-" * 60)
-
-    resources = [
-        {
-            "uri": "config://pricing",
-            "description": "Get current pricing information for all services"
-        },
-        {
-            "uri": "config://models",
-            "description": "Get information about available AI models"
-        }
-    ]
+    lines = ["\n\nAvailable Resources:", "-" * 60]
 
-    for i, resource in enumerate(resources, 1):
-        print(f"\n{i}. {resource['uri']}")
-        print(f"   Description: {resource['description']}")
+    _, resources, _ = _registry()
+    for i, (uri, resource) in enumerate(sorted(resources.items()), 1):
+        lines.append(f"\n{i}. {uri}")
+        lines.append(f"   Description: {_first_line(resource.description)}")
+
+    # Both resources are serialized once at import, so repeat reads must
+    # return the identical object (cache-aside hit, no re-serialization).
+    # .fn: @mcp.resource rebinds each name to a FunctionResource; the
+    # underlying function lives on .fn
+    assert get_pricing_info.fn() is get_pricing_info.fn()
+    assert get_available_models.fn() is get_available_models.fn()
+    etag = json.loads(get_pricing_info.fn()).get("etag")
+    lines.append(f"\n✅ Resource payloads are cached (pricing ETag: {etag[:12]}...)")
+
+    return lines
 
 
 def list_prompts():
     """List all available prompts."""
-    print("\n\nAvailable Prompts:")
-    print("-" * 60)
-
-    prompts = [
-        {
-            "name": "campaign_planner",
-            "description": "Generate a comprehensive marketing campaign plan"
-        },
-        {
-            "name": "image_prompt_enhancer",
-            "description": "Enhance image generation prompts for better results"
-        }
-    ]
+    lines = ["\n\nAvailable Prompts:", "-" * 60]
 
-    for i, prompt in enumerate(prompts, 1):
-        print(f"\n{i}. {prompt['name']}")
-        print(f"   Description: {prompt['description']}")
+    _, _, prompts = _registry()
+    for i, (name, prompt) in enumerate(sorted(prompts.items()), 1):
+        lines.append(f"\n{i}. {name}")
+        lines.append(f"   Description: {_first_line(prompt.description)}")
 
+    return lines
 
-def show_usage_examples():
-    """Show usage examples."""
-    print("\n\nUsage Examples:")
-    print("=" * 60)
 
-    examples = [
-        {
-            "title": "Generate a Product Image",
-            "code": '''generate_image_imagen3(
+# Usage examples as a module constant: built once at import instead of
+# rebuilding the list/dict literals on every call; titles are interned
+# so they compare by identity if they ever key a registry
+EXAMPLES = (
+    (sys.intern("Generate a Product Image"), '''generate_image_imagen3(
     prompt="Professional product photography of a smartwatch,
     white background, studio lighting, high detail",
     aspect_ratio="1:1",
     quality="hd"
-)'''
-        },
-        {
-            "title": "Create Marketing Copy",
-            "code": '''generate_marketing_content(
+)'''),
+    (sys.intern("Create Marketing Copy"), '''generate_marketing_content(
     content_type="social_post",
     topic="New AI-powered analytics platform launch",
     tone="enthusiastic",
     length="medium",
     model="claude",
     include_hashtags=True
-)'''
-        },
-        {
-            "title": "Estimate Campaign Costs",
-            "code": '''calculate_cost_estimate(
+)'''),
+    (sys.intern("Estimate Campaign Costs"), '''calculate_cost_estimate(
     images_hd=10,
     images_sd=20,
     video_seconds=30,
     content_pieces=15
-)'''
-        }
-    ]
+)'''),
+)
+
+
+def show_usage_examples():
+    """Show usage examples."""
+    lines = ["\n\nUsage Examples:", "=" * 60]
+
+    for i, (title, code) in enumerate(EXAMPLES, 1):
+        lines.append(f"\n{i}. {title}")
+        lines.append("-" * 60)
+        lines.append(code)
 
-    for i, example in enumerate(examples, 1):
-        print(f"\n{i}. {example['title']}")
-        print("-" * 60)
-        print(example['code'])
+    return lines
 
 
 def main():
     """Display server information."""
-    print("=" * 60)
-    print("Marketing Automation MCP Server")
-    print("=" * 60)
-    print(f"\nServer Name: {mcp.name}")
-    print("Version: 0.1.0")
-    print("FastMCP Version: 2.13.0")
-    print("\nStatus: Ready (awaiting API configuration)")
-    print("=" * 60)
-
-    list_tools()
-    list_resources()
-    list_prompts()
-    show_usage_examples()
-
-    print("\n" + "=" * 60)
-    print("Setup Instructions:")
-    print("=" * 60)
-    print("\n1. Configure environment:")
-    print("   cp .env.example .env")
-    print("   # Edit .env with your API keys")
-    print("\n2. Run server locally (STDIO for Claude Desktop):")
-    print("   python server.py")
-    print("\n3. Run server in HTTP mode (for deployment):")
-    print("   python server.py --http")
-    print("\n4. Add to Claude Desktop:")
-    print("   See claude_desktop_config.example.json")
-    print("\n" + "=" * 60)
+    lines = [
+        "=" * 60,
+        "Marketing Automation MCP Server",
+        "=" * 60,
+        f"\nServer Name: {mcp.name}",
+        "Version: 0.1.0",
+        "FastMCP Version: 2.13.0",
+        "\nStatus: Ready (awaiting API configuration)",
+        "=" * 60,
+    ]
+
+    lines += list_tools()
+    lines += list_resources()
+    lines += list_prompts()
+    lines += show_usage_examples()
+
+    lines += [
+        "\n" + "=" * 60,
+        "Setup Instructions:",
+        "=" * 60,
+        "\n1. Configure environment:",
+        "   cp .env.example .env",
+        "   # Edit .env with your API keys",
+        "\n2. Run server locally (STDIO for Claude Desktop):",
+        "   python server.py",
+        "\n3. Run server in HTTP mode (for deployment):",
+        "   python server.py --http",
+        "\n4. Add to Claude Desktop:",
+        "   See claude_desktop_config.example.json",
+        "\n" + "=" * 60,
+    ]
+
+    # One write + one flush for the whole report instead of a syscall
+    # (and stdout lock acquisition) per print
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":